@@ -9,9 +9,25 @@ Finally, find the most profitable product overall.
 '''
 import pandas as pd
 
-sales = pd.read_csv('sales.csv')
+CHUNK_SIZE = 1_000_000
+# Fixed dtypes let the C parser skip type inference
+SALES_DTYPES = {
+    'product': 'category',
+    'quantity': 'int32',
+    'price_per_unit': 'float64',
+    'cost_per_unit': 'float64',
+}
 
-sales['total_revenue'] = sales['quantity'] * sales['price_per_unit']
-sales['total_cost'] = sales['quantity'] * sales['cost_per_unit']
-sales['profit'] = sales['total_revenue'] - sales['total_cost']
-most_profitable_product = sales.loc[sales['profit'].idxmax()]
+# Stream the file and keep running per-product totals so memory is bounded by the chunk size
+totals_per_product = None
+for sales in pd.read_csv('sales.csv', chunksize=CHUNK_SIZE, engine='c',
+                         usecols=list(SALES_DTYPES), dtype=SALES_DTYPES):
+    # Aggregate per product before deriving profit, so only K-length series are kept instead of N-length columns
+    chunk_totals = pd.DataFrame({
+        'total_revenue': sales.eval('quantity * price_per_unit'),
+        'total_cost': sales.eval('quantity * cost_per_unit'),
+    }).groupby(sales['product'], observed=True).sum()
+    totals_per_product = chunk_totals if totals_per_product is None else totals_per_product.add(chunk_totals, fill_value=0)
+
+totals_per_product['profit'] = totals_per_product['total_revenue'] - totals_per_product['total_cost']
+most_profitable_product = totals_per_product['profit'].idxmax()
\ No newline at end of file
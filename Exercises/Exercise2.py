@@ -65,24 +65,79 @@ Exceptions
 JSON
 ''' 
 
-import json
+import atexit
 import logging
+import logging.handlers
+import orjson
+import queue
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, ValidationError
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict, ValidationError
 from typing import List, Optional
 import asyncio
 import aiohttp
+import operator
+import os
+import sys
+import time
 import uvicorn
 
-logging.basicConfig(
-    level=logging.ERROR,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
+logger = logging.getLogger(__name__)
+
+# Name of the root QueueHandler; checked on the (process-wide) root logger so logging is only installed once,
+# even if this module is imported twice (as __main__ and as Exercise2)
+LOG_HANDLER_NAME = "solution_errors"
+_log_queue_handler: logging.handlers.QueueHandler | None = None
+_log_listener: logging.handlers.QueueListener | None = None
+_previous_root_level: int | None = None
+
+def start_logging():
+    """
+    Route error logs to solution_errors.log and stderr through a queue, once per process
+    
+    Log calls only enqueue the record; the listener's background thread does the blocking writes off the event loop.
+    """
+    global _log_queue_handler, _log_listener, _previous_root_level
+    root_logger = logging.getLogger()
+    if any(handler.name == LOG_HANDLER_NAME for handler in root_logger.handlers):
+        return
+    
+    log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    log_handlers = [
         logging.FileHandler('solution_errors.log'),
         logging.StreamHandler()
     ]
-)
-logger = logging.getLogger(__name__)
+    for handler in log_handlers:
+        handler.setFormatter(log_formatter)
+    
+    log_queue = queue.SimpleQueue()
+    _log_queue_handler = logging.handlers.QueueHandler(log_queue)
+    _log_queue_handler.name = LOG_HANDLER_NAME
+    _log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+    
+    _previous_root_level = root_logger.level
+    root_logger.setLevel(logging.ERROR)
+    root_logger.addHandler(_log_queue_handler)
+    _log_listener.start()
+
+def stop_logging():
+    """
+    Detach the queue handler, flush the queued records, close the file/stream handlers and restore the root level
+    """
+    global _log_queue_handler, _log_listener, _previous_root_level
+    if _log_listener is None:
+        return
+    
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_log_queue_handler)
+    root_logger.setLevel(_previous_root_level)
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    _log_queue_handler = _log_listener = _previous_root_level = None
+
+atexit.register(stop_logging)
 
 class StarWarsAPIError(Exception):
     """Custom exception for Star Wars API related errors"""
@@ -107,12 +162,60 @@ class Person(BaseModel):
     url: str
 
 class PersonResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     name: str
     height: str
     mass: str
     hair_color: str
 
-app = FastAPI(title="Star Wars Characters API", version="1.0.0")
+# Shared across requests so connections and DNS lookups are reused; opened and closed by lifespan()
+_session: aiohttp.ClientSession | None = None
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session with a pooled connector, DNS cache and timeouts tuned for the SWAPI fan-out
+    """
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=50,
+        ttl_dns_cache=300,
+        enable_cleanup_closed=True,
+        keepalive_timeout=30
+    )
+    timeout = aiohttp.ClientTimeout(total=10, connect=3)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        json_serialize=lambda obj: orjson.dumps(obj).decode()
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start logging and open the shared aiohttp session on startup; close both on shutdown
+    
+    The initial fetch and result.json write run in the background so they do not delay startup.
+    """
+    global _session, _solution_cache
+    start_logging()
+    _session = create_session()
+    startup_task = asyncio.create_task(write_initial_results())
+    yield
+    pending_tasks = [startup_task]
+    if _solution_cache is not None:
+        pending_tasks.append(_solution_cache[1])
+    for task in pending_tasks:
+        task.cancel()
+    # let cancelled fetches finish unwinding before their session is closed
+    await asyncio.gather(*pending_tasks, return_exceptions=True)
+    await _session.close()
+    # later calls fall back to a temporary session instead of reusing the closed one
+    _session = None
+    _solution_cache = None
+    stop_logging()
+
+app = FastAPI(title="Star Wars Characters API", version="1.0.0", lifespan=lifespan)
 
 URLS = (
     "https://swapi.dev/api/people/1",
@@ -136,7 +239,7 @@ async def fetch_character_data(url: str, session: aiohttp.ClientSession) -> Pers
                 logger.error(f"HTTP {response.status} for URL: {url}")
                 raise StarWarsAPIError(f"HTTP {response.status} error for {url}")
             
-            data = await response.json()
+            data = await response.json(loads=orjson.loads)
             
             if not data:
                 logger.error(f"Empty response data from URL: {url}")
@@ -154,40 +257,100 @@ async def fetch_character_data(url: str, session: aiohttp.ClientSession) -> Pers
         logger.error(f"Unexpected error fetching {url}: {str(e)}")
         raise StarWarsAPIError(f"Unexpected error: {str(e)}")
 
-async def solution() -> List[Person]:
+async def fetch_character_or_none(url: str, session: aiohttp.ClientSession) -> Person | None:
+    """
+    Fetch character data, returning None instead of raising so one failed URL does not cancel the others
+    
+    The error has already been logged by fetch_character_data.
+    """
+    try:
+        return await fetch_character_data(url, session)
+    except StarWarsAPIError:
+        return None
+
+async def solution(session: aiohttp.ClientSession | None = None) -> List[Person]:
     """
     Main solution function that aggregates responses from URLs and returns data sorted by height in descending order
     
+    Parameters:
+    - session: aiohttp.ClientSession | None - The aiohttp session to reuse for every request;
+      a temporary one is opened when None (e.g. outside the app lifespan)
     returns:
     - List of Person objects sorted by height descending
+    raises:
+    - StarWarsAPIError if no URL could be fetched
     """
+    start_logging()
+    if session is None:
+        async with create_session() as temporary_session:
+            return await solution(temporary_session)
+    
     characters = []
     
-    async with aiohttp.ClientSession() as session:
-        tasks = [fetch_character_data(url, session) for url in URLS]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, Exception):
-                continue
-            if result:
-                characters.append(result)
+    async with asyncio.TaskGroup() as task_group:
+        tasks = [task_group.create_task(fetch_character_or_none(url, session)) for url in URLS]
+    
+    for task in tasks:
+        result = task.result()
+        if result:
+            # height is a str (e.g. "unknown"), so convert it once here and sort on the int
+            height = int(result.height) if result.height.isdigit() else 0
+            characters.append((height, result))
     
-    characters.sort(key=lambda x: int(x.height) if x.height.isdigit() else 0, reverse=True)
+    if not characters:
+        # every URL failed (already logged); raise so callers and the cache do not treat it as an empty result
+        raise StarWarsAPIError("No character data could be fetched from any URL")
     
-    return characters
+    characters.sort(key=operator.itemgetter(0), reverse=True)
+    
+    return [character for _, character in characters]
+
+# solution() results are shared by every endpoint hit within the same CACHE_TTL_SECONDS window
+CACHE_TTL_SECONDS = 30
+_solution_cache: tuple[int, asyncio.Task] | None = None
 
-def write_results_to_file(characters: List[Person], filename: str = "result.json"):
+async def fetch_characters_with_payload(session: aiohttp.ClientSession | None) -> tuple[List[Person], List[dict], bytes]:
     """
-    Write the results to a JSON file
+    Run solution() and dump/serialize its result once, so cached callers do no further Pydantic work
+    """
+    characters = await solution(session)
+    character_dicts = [char.model_dump() for char in characters]
+    return characters, character_dicts, orjson.dumps(character_dicts)
+
+async def cached_solution() -> tuple[List[Person], List[dict], bytes]:
     """
+    Return the result of solution() using the shared session, fetching at most once per CACHE_TTL_SECONDS
+    
+    Concurrent callers in the same window await the same in-flight fetch.
+    returns:
+    - List of Person objects sorted by height descending
+    - The same list dumped to dicts
+    - The same list serialized to compact JSON bytes
+    """
+    global _solution_cache
+    window = int(time.monotonic() // CACHE_TTL_SECONDS)
+    if _solution_cache is None or _solution_cache[0] != window:
+        _solution_cache = (window, asyncio.ensure_future(fetch_characters_with_payload(_session)))
+    
+    task = _solution_cache[1]
     try:
-        character_dicts = [char.model_dump() for char in characters]
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(character_dicts, f, indent=2, ensure_ascii=False)
+        # shield so a cancelled request does not cancel the fetch other callers are waiting on
+        return await asyncio.shield(task)
+    except Exception:
+        # do not keep serving a failed fetch from the cache
+        if _solution_cache is not None and _solution_cache[1] is task:
+            _solution_cache = None
+        raise
+
+def write_results_to_file(character_dicts: List[dict], filename: str = "result.json"):
+    """
+    Write the dumped characters to a JSON file
+    """
+    try:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(character_dicts, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
-        logger.info(f"Successfully wrote {len(characters)} characters to {filename}")
+        logger.info(f"Successfully wrote {len(character_dicts)} characters to {filename}")
         
     except Exception as e:
         logger.error(f"Error writing to file {filename}: {str(e)}")
@@ -203,8 +366,8 @@ async def get_characters_sorted():
     Get Star Wars characters sorted by height in descending order
     """
     try:
-        characters = await solution()
-        return [PersonResponse.model_validate(char.model_dump()) for char in characters]
+        characters, _, _ = await cached_solution()
+        return [PersonResponse.model_validate(char) for char in characters]
     except Exception as e:
         logger.error(f"Error in get_characters_sorted: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -215,7 +378,9 @@ async def get_characters_full():
     Get full Star Wars characters data sorted by height in descending order
     """
     try:
-        return await solution()
+        # Serve the cached compact bytes directly; they were dumped from validated Person models
+        _, _, payload = await cached_solution()
+        return Response(content=payload, media_type="application/json")
     except Exception as e:
         logger.error(f"Error in get_characters_full: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -226,8 +391,8 @@ async def write_characters_to_file():
     Execute solution and write results to file
     """
     try:
-        characters = await solution()
-        write_results_to_file(characters)
+        characters, character_dicts, _ = await cached_solution()
+        write_results_to_file(character_dicts)
         return {
             "message": f"Successfully processed {len(characters)} characters",
             "file": "result.json",
@@ -237,17 +402,27 @@ async def write_characters_to_file():
         logger.error(f"Error in write_characters_to_file: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def main():
-        try:
-            characters = await solution()
-            write_results_to_file(characters)
-            print(f"Successfully processed {len(characters)} characters")
-            print("Results written to result.json")
-            print("Errors logged to solution_errors.log")
-        except Exception as e:
-            print(f"Error: {e}")
+async def write_initial_results():
+    """
+    Fetch the characters once on startup and write them to result.json
+    """
+    try:
+        _, character_dicts, _ = await cached_solution()
+        write_results_to_file(character_dicts)
+    except Exception as e:
+        logger.error(f"Error writing initial results: {str(e)}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
-    
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Extra workers are opt-in: each one keeps its own cache and does its own startup fetch and result.json write
+    workers = int(os.environ.get("EXERCISE2_WORKERS", "1"))
+    # uvicorn can only spawn workers from an import string, which must match how this module was started
+    app_target = app if workers == 1 else f"{__spec__.name if __spec__ else 'Exercise2'}:app"
+    # uvloop is not available on Windows
+    uvicorn.run(
+        app_target,
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=workers
+    )
\ No newline at end of file
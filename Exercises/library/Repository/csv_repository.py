@@ -1,11 +1,27 @@
-import pandas as pd
+import csv
+import logging
+from collections import Counter
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
+from pydantic import TypeAdapter, ValidationError
 from ..Model.book import Book
 
+logger = logging.getLogger(__name__)
+
+CSV_COLUMNS = ['id', 'title', 'author', 'year', 'isbn']
+# Validates every CSV row in a single call instead of one Book(**row) per row
+BOOKS_ADAPTER = TypeAdapter(List[Book])
+
 class CSV_Repository:
     
-    books_dataframe: pd.DataFrame
+    # In-memory copy of the CSV keyed by book id, loaded once on startup; this process is the only writer
+    books: Dict[int, Book]
+    # Always max(books) + 1, kept up to date so add() does not scan every id
+    next_id: int
+    # Header of the CSV file on disk, so appended rows line up with its columns
+    csv_fieldnames: Optional[List[str]]
+    # Rows that failed validation; not served, but written back on save so they are never silently lost
+    invalid_rows: List[dict]
     
     def __init__(self, csv_file: str = "books.csv"):
         self.csv_file = Path(csv_file)
@@ -14,7 +30,9 @@ class CSV_Repository:
     def initialize(self):
         """Initialize the CSV file with headers if it doesn't exist"""
         if not self.csv_file.exists():
-            self.books_dataframe = pd.DataFrame(columns=['id', 'title', 'author', 'year', 'isbn'])
+            self.books = {}
+            self.invalid_rows = []
+            self.next_id = 1
             self.save_to_csv()
         else:
             self.load_from_csv()
@@ -22,109 +40,130 @@ class CSV_Repository:
     def load_from_csv(self):
         """Load books from CSV file"""
         try:
-            self.books_dataframe = pd.read_csv(self.csv_file)
-            if not self.books_dataframe.empty and 'id' in self.books_dataframe.columns:
-                self.books_dataframe['id'] = self.books_dataframe['id'].astype(int)
-        except (pd.errors.EmptyDataError, FileNotFoundError):
-            self.books_dataframe = pd.DataFrame(columns=['id', 'title', 'author', 'year', 'isbn'])
+            with open(self.csv_file, newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+                self.csv_fieldnames = reader.fieldnames
+        except FileNotFoundError:
+            rows = []
+            self.csv_fieldnames = None
+        
+        self.invalid_rows = []
+        try:
+            books = BOOKS_ADAPTER.validate_python(rows)
+        except ValidationError:
+            # Fall back to row by row validation so one bad row does not take down the whole repository
+            books = []
+            for line_number, row in enumerate(rows, start=2):
+                try:
+                    books.append(Book(**row))
+                except ValidationError as e:
+                    logger.error(f"Skipping invalid book on line {line_number} of {self.csv_file}: {str(e)}")
+                    self.invalid_rows.append(row)
+        
+        self.books = {book.id: book for book in books}
+        self.next_id = self._max_id() + 1
     
     def save_to_csv(self):
         """Save books to CSV file"""
-        if self.books_dataframe is not None:
-            self.books_dataframe.to_csv(self.csv_file, index=False)
+        with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(book.model_dump() for book in self.books.values())
+            writer.writerows({column: row.get(column, '') for column in CSV_COLUMNS} for row in self.invalid_rows)
+        self.csv_fieldnames = CSV_COLUMNS
+    
+    def _can_append(self) -> bool:
+        """Check that the file has our columns and ends on a complete line, so an appended row cannot corrupt it"""
+        if self.csv_fieldnames is None or sorted(self.csv_fieldnames) != sorted(CSV_COLUMNS):
+            return False
+        try:
+            with open(self.csv_file, 'rb') as f:
+                f.seek(-1, 2)
+                return f.read(1) == b'\n'
+        except OSError:
+            return False
+    
+    def append_to_csv(self, book: Book):
+        """Append a single book to the CSV file without rewriting it, falling back to a full save when that is unsafe"""
+        if not self._can_append():
+            self.save_to_csv()
+            return
+        with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
+            csv.DictWriter(f, fieldnames=self.csv_fieldnames).writerow(book.model_dump())
+    
+    def _max_id(self) -> int:
+        """Get the highest ID in use, including IDs held by invalid rows"""
+        invalid_ids = [int(row['id']) for row in self.invalid_rows if str(row.get('id', '')).strip().isdigit()]
+        return max([*self.books, *invalid_ids], default=0)
     
     def _get_next_id(self) -> int:
-        """Get the next available ID"""
-        if self.books_dataframe.empty or 'id' not in self.books_dataframe.columns:
-            return 1
-        return self.books_dataframe['id'].max() + 1 if not self.books_dataframe.empty else 1
+        """Reserve and return the next available ID"""
+        book_id = self.next_id
+        self.next_id += 1
+        return book_id
     
     def get_all(self) -> List[Book]:
         """Get all books"""
-        self.load_from_csv()
-        if self.books_dataframe.empty:
-            return []
-        
-        books = []
-        for _, row in self.books_dataframe.iterrows():
-            book_data = row.to_dict()
-            books.append(Book(**book_data))
-        return books
+        return list(self.books.values())
     
     def get(self, book_id: int) -> Optional[Book]:
         """Get a book by ID"""
-        self.load_from_csv()
-        if self.books_dataframe.empty:
-            return None
-        
-        book_data = self.books_dataframe[self.books_dataframe['id'] == book_id]
-        if book_data.empty:
-            return None
-        
-        return Book(**book_data.iloc[0].to_dict())
+        return self.books.get(book_id)
     
     def add(self, book: Book) -> Book:
         """Add a new book"""
-        self.load_from_csv()
-        
         # Create new book with ID
         new_book = book.model_copy()
         new_book.id = self._get_next_id()
         
-        # Convert to DataFrame and append
-        new_book_df = pd.DataFrame([new_book.model_dump()])
-        self.books_dataframe = pd.concat([self.books_dataframe, new_book_df], ignore_index=True)
-        self.save_to_csv()
+        self.books[new_book.id] = new_book
+        self.append_to_csv(new_book)
         
         return new_book
     
     def update(self, book_id: int, book: Book) -> Optional[Book]:
         """Update a book"""
-        self.load_from_csv()
-        
-        if self.books_dataframe.empty or book_id not in self.books_dataframe['id'].values:
+        if book_id not in self.books:
             return None
         
         # Update the book
         updated_book = book.model_copy()
         updated_book.id = book_id
         
-        # Update in DataFrame
-        mask = self.books_dataframe['id'] == book_id
-        for column in ['title', 'author', 'year', 'isbn']:
-            self.books_dataframe.loc[mask, column] = getattr(updated_book, column)
-        
+        self.books[book_id] = updated_book
         self.save_to_csv()
         return updated_book
     
     def remove(self, book_id: int) -> bool:
         """Remove a book by ID"""
-        self.load_from_csv()
-        
-        if self.books_dataframe.empty or book_id not in self.books_dataframe['id'].values:
+        if book_id not in self.books:
             return False
         
         # Remove the book
-        self.books_dataframe = self.books_dataframe[self.books_dataframe['id'] != book_id]
+        del self.books[book_id]
+        if book_id == self.next_id - 1:
+            self.next_id = self._max_id() + 1
         self.save_to_csv()
         return True
     
     def get_books_statistics(self) -> dict:
-        """Get statistics about the books collection using pandas"""
-        self.load_from_csv()
-        
-        if self.books_dataframe.empty:
+        """Get statistics about the books collection"""
+        if not self.books:
             return {"total_books": 0, "message": "No books in collection"}
         
+        years = [book.year for book in self.books.values()]
+        books_per_author = Counter(book.author for book in self.books.values())
+        
         stats = {
-            "total_books": len(self.books_dataframe),
-            "authors_count": self.books_dataframe['author'].nunique(),
+            "total_books": len(self.books),
+            "authors_count": len(books_per_author),
             "publication_years": {
-                "oldest": int(self.books_dataframe['year'].min()),
-                "newest": int(self.books_dataframe['year'].max()),
-                "average": float(round(self.books_dataframe['year'].mean(), 1))
+                "oldest": min(years),
+                "newest": max(years),
+                "average": round(sum(years) / len(years), 1)
             },
-            "books_per_author": self.books_dataframe['author'].value_counts().to_dict()
+            "books_per_author": dict(books_per_author.most_common())
         }
         
-        return stats
\ No newline at end of file
+        return stats